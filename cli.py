@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Command-line entry point for the data pipeline.
+
+Each stage is a subcommand. Census data moves between stages as a single
+"bundle" stream (see `CensusBlock.subtree_to_bundle`), so stages can be
+chained in a shell pipeline:
+
+    python3 cli.py generate --layers 3 --fanout 5 > raw.csv
+    python3 cli.py blur --epsilon 0.1 < raw.csv \
+        | python3 cli.py district --districts 10 --party D \
+        | python3 cli.py score -i raw.csv --plan -
+
+`-` (the default) means stdin/stdout. Use `--in-dir`/`--out-dir` to read or
+write the three separate CSVs described in the README instead. `--in-dir` also
+accepts the sharded output of `generate --workers`.
+
+Heavy dependencies (NumPy, pandas, networkx) are only imported by the
+subcommands that need them.
+"""
+
+import argparse
+import csv
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+from datagen.census import census_csv_paths, merged_csv_paths
+
+@contextmanager
+def _open_stream(path, mode):
+    """Open `path`, treating '-' as stdin/stdout."""
+    if path == '-':
+        yield sys.stdin if 'r' in mode else sys.stdout
+    else:
+        with open(path, mode, newline="") as file:
+            yield file
+
+def _read_census(args):
+    from datagen.census import census_from_bundle, census_from_csv
+
+    if args.in_dir is not None:
+        return census_from_csv(*census_csv_paths(args.in_dir))
+    with _open_stream(args.input, 'r') as file:
+        return census_from_bundle(file)
+
+def _write_census(tree, args):
+    if args.out_dir is not None:
+        Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+        adjacency, demographic, hierarchy = merged_csv_paths(args.out_dir)
+        tree.subtree_to_csv(adjacency_outfile=adjacency,
+                            demographic_outfile=demographic,
+                            hierarchy_outfile=hierarchy)
+        return
+    with _open_stream(args.output, 'w') as file:
+        tree.subtree_to_bundle(file)
+
+def _seed(seed):
+    if seed is None:
+        return
+    import random
+    import numpy as np
+    random.seed(seed)
+    np.random.seed(seed)
+
+def cmd_generate(args):
+    if args.population < 0 or args.jerries < 0:
+        sys.exit("generate: --population and --jerries can't be negative")
+    if args.jerries > args.population:
+        sys.exit("generate: --jerries can't be larger than --population")
+
+    if args.workers is not None:
+        _generate_sharded(args)
+        return
+    if args.merge:
+        sys.exit("generate: --merge needs --workers")
+
+    from datagen.datagen import run_mock_census
+
+    _seed(args.seed)
+    tree = run_mock_census(num_layers=args.layers, fanout=args.fanout,
+                           total_pop=args.population, total_jerries=args.jerries)
+    _write_census(tree, args)
+
+def _generate_sharded(args):
+    from datagen.sharded import run_sharded_census, merge_shards
+
+    if args.out_dir is None:
+        sys.exit("generate: --workers needs --out-dir")
+
+    # Later stages read the shards directly via `--in-dir`; merging is an
+    # extra serial pass over the whole census, so only do it when asked.
+    out_dir = Path(args.out_dir)
+    shard_dirs = run_sharded_census(num_layers=args.layers, fanout=args.fanout,
+                                    total_pop=args.population,
+                                    total_jerries=args.jerries,
+                                    outdir=out_dir / 'shards',
+                                    workers=args.workers, seed=args.seed)
+    if args.merge:
+        merge_shards(shard_dirs, *merged_csv_paths(out_dir))
+
+def cmd_blur(args):
+    from datagen.blur import blur_census_data
+
+    _seed(args.seed)
+    tree = _read_census(args)
+    blur_census_data(tree, epsilon=args.epsilon)
+    _write_census(tree, args)
+
+def cmd_district(args):
+    from datagen.census import split_bundle
+    from gerrymandering import gerrymander, write_plan
+
+    if args.in_dir is not None:
+        adjacency, demographic, hierarchy = census_csv_paths(args.in_dir)
+    else:
+        with _open_stream(args.input, 'r') as file:
+            adjacency, demographic, hierarchy = split_bundle(file)
+
+    result = gerrymander(adjacency, demographic, hierarchy,
+                         args.districts, args.party, return_stats=args.stats)
+    if args.stats:
+        districts, stats = result
+        print(stats, file=sys.stderr)
+    else:
+        districts = result
+
+    with _open_stream(args.output, 'w') as file:
+        write_plan(districts, file)
+
+def cmd_score(args):
+    import metrics
+    from gerrymandering import read_plan
+
+    if args.plan == '-' and args.in_dir is None and args.input == '-':
+        sys.exit("score: the census and the plan can't both be read from stdin")
+
+    if args.stream:
+        gap, details = _score_streaming(args)
+    else:
+        with _open_stream(args.plan, 'r') as file:
+            districts = read_plan(file)
+        tree = _read_census(args)
+        gap, details = metrics.efficiency_gap(tree, districts)
+
+    with _open_stream(args.output, 'w') as file:
+        print(f"efficiency_gap,{gap}", file=file)
+        if args.details and details:
+            writer = csv.DictWriter(file, fieldnames=list(details[0].keys()))
+            writer.writeheader()
+            writer.writerows(details)
+
+def _score_streaming(args):
+    import metrics
+
+    if args.in_dir is not None:
+        _, demographic, hierarchy = census_csv_paths(args.in_dir)
+        census_files = _as_list(demographic) + _as_list(hierarchy)
+    elif args.input != '-':
+        census_files = args.input
+    else:
+        sys.exit("score: --stream needs the census in a file, not stdin")
+
+    with _open_stream(args.plan, 'r') as file:
+        return metrics.efficiency_gap_from_files(census_files, file,
+                                                 chunk_size=args.chunk_size)
+
+def _as_list(paths):
+    return list(paths) if isinstance(paths, (list, tuple)) else [paths]
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def _add_census_input(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-i', '--input', default='-',
+                       help="census bundle to read ('-' for stdin, the default)")
+    group.add_argument('--in-dir', default=None,
+                       help="read adjacency/demographic/hierarchy CSVs (or shards) "
+                            "from this directory")
+
+def _add_census_output(parser):
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-o', '--output', default='-',
+                       help="census bundle to write ('-' for stdout, the default)")
+    group.add_argument('--out-dir', default=None,
+                       help="write adjacency/demographic/hierarchy CSVs to this directory")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate = subparsers.add_parser('generate', help="create a synthetic census")
+    generate.add_argument('--layers', type=_positive_int, default=2)
+    generate.add_argument('--fanout', type=_positive_int, default=2)
+    generate.add_argument('--population', type=int, default=400)
+    generate.add_argument('--jerries', type=int, default=10,
+                          help="number of people positive for the trait")
+    generate.add_argument('--seed', type=int, default=None)
+    generate.add_argument('--workers', type=_positive_int, default=None,
+                          help="generate each top-level subtree in its own process, "
+                               "using up to this many workers (needs --out-dir)")
+    generate.add_argument('--merge', action='store_true',
+                          help="with --workers, also merge the shards into one set of "
+                               "CSVs (a serial pass over the whole census)")
+    _add_census_output(generate)
+    generate.set_defaults(func=cmd_generate)
+
+    blur = subparsers.add_parser('blur', help="add noise to a census")
+    blur.add_argument('--epsilon', type=float, default=0.5)
+    blur.add_argument('--seed', type=int, default=None)
+    _add_census_input(blur)
+    _add_census_output(blur)
+    blur.set_defaults(func=cmd_blur)
+
+    district = subparsers.add_parser('district', help="gerrymander a census into districts")
+    district.add_argument('--districts', type=_positive_int, required=True)
+    district.add_argument('--party', choices=['D', 'R'], required=True,
+                          help="the party to gerrymander for")
+    district.add_argument('--stats', action='store_true',
+                          help="print stage timings and counters to stderr")
+    _add_census_input(district)
+    district.add_argument('-o', '--output', default='-',
+                          help="plan CSV to write ('-' for stdout, the default)")
+    district.set_defaults(func=cmd_district)
+
+    score = subparsers.add_parser('score', help="compute the efficiency gap of a plan")
+    score.add_argument('--plan', required=True,
+                       help="plan CSV written by `district` ('-' for stdin)")
+    score.add_argument('--details', action='store_true',
+                       help="also print the per-district breakdown as CSV")
+    score.add_argument('--stream', action='store_true',
+                       help="stream the census from disk instead of loading it into memory")
+    score.add_argument('--chunk-size', type=_positive_int, default=1_000_000,
+                       help="with --stream, plan rows to hold in memory at once; "
+                            "each chunk is one pass over the demographic and "
+                            "hierarchy rows")
+    _add_census_input(score)
+    score.add_argument('-o', '--output', default='-',
+                       help="where to write the score ('-' for stdout, the default)")
+    score.set_defaults(func=cmd_score)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,18 @@
-from .census import CensusBlock
-from .datagen import run_mock_census
-from .blur import blur_census_data
+from .census import CensusBlock, census_from_csv, census_from_bundle, census_csv_paths
+
+# The generator and blurring modules need NumPy, which is slow to import.
+# Load them on first use so that `import datagen` (and `metrics`) stay cheap.
+_LAZY_ATTRS = {
+    'run_mock_census': '.datagen',
+    'blur_census_data': '.blur',
+    'run_sharded_census': '.sharded',
+    'merge_shards': '.sharded',
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,34 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, Iterator, List, TextIO, Tuple
 import csv
+import io
+from contextlib import contextmanager
 from pathlib import Path
 
 id_counter: int = 0
 
+ADJACENCY_HEADER = ["blockA", "blockB"]
+DEMOGRAPHIC_HEADER = ["block", "population", "num_positive"]
+HIERARCHY_HEADER = ["parent_block", "child_block"]
+
+# Sections of a census bundle, keyed by their header row.
+_SECTIONS = {
+    tuple(ADJACENCY_HEADER): 'adjacency',
+    tuple(DEMOGRAPHIC_HEADER): 'demographic',
+    tuple(HIERARCHY_HEADER): 'hierarchy',
+}
+_HEADER_LINES = {",".join(header): name for header, name in _SECTIONS.items()}
+
+# Default file names for a census written as separate CSVs.
+ADJACENCY_CSV = 'adjacency.csv'
+DEMOGRAPHIC_CSV = 'demographic.csv'
+HIERARCHY_CSV = 'hierarchy.csv'
+
+# Layout of a sharded census (see `datagen.sharded`): the root block lives in
+# `root/`, and each top-level subtree in `shard-<n>/`.
+SHARD_ROOT_DIR = 'root'
+SHARD_DIR_PREFIX = 'shard-'
+
 def _assign_id() -> int:
     """Every block is assigned a unique ID"""
     global id_counter
@@ -30,6 +54,19 @@ class CensusBlock:
         _write_demographic_csv(flat_tree, demographic_outfile)
         _write_hierarchy_csv(flat_tree, hierarchy_outfile)
 
+    def subtree_to_bundle(self, outfile: TextIO):
+        """Writes the tree rooted on this node to a single text stream.
+
+        A bundle is the three census CSVs concatenated, in the order
+        adjacency, demographic, hierarchy. Each section starts with its usual
+        header row, so a bundle can be piped between pipeline stages.
+        """
+        flat_tree = _gather_all_blocks(self)
+        writer = csv.writer(outfile)
+        _write_adjacency_rows(flat_tree, writer)
+        _write_demographic_rows(flat_tree, writer)
+        _write_hierarchy_rows(flat_tree, writer)
+
     def node_to_string(self):
         """Generate a string representation of this CensusBlock (no children)"""
         return f"Blk(id={self.id}, pop={self.population}, jerries={self.jerries})"
@@ -63,38 +100,38 @@ def _write_adjacency_csv(blocks: List[CensusBlock], filename):
     with open(filename, mode="w", newline="") as file:
         file.seek(0)
         file.truncate(0)
-
-        writer = csv.writer(file)
-        writer.writerow(["blockA", "blockB"])
-        
-        for block in blocks:
-            for sibling in block.siblings:
-                writer.writerow([block.id, sibling.id])
+        _write_adjacency_rows(blocks, csv.writer(file))
 
 def _write_demographic_csv(blocks: List[CensusBlock], filename):
     with open(filename, mode="w", newline="") as file:
         file.seek(0)
         file.truncate(0)
-
-        writer = csv.writer(file)
-        writer.writerow(["block", "population", "num_positive"])
-        for block in blocks:
-            writer.writerow([block.id, block.population, block.jerries])
+        _write_demographic_rows(blocks, csv.writer(file))
 
 def _write_hierarchy_csv(blocks: List[CensusBlock], filename):
     with open(filename, mode="w", newline="") as file:
         file.seek(0)
         file.truncate(0)
-        writer = csv.writer(file)
-        writer.writerow(["parent_block", "child_block"])
+        _write_hierarchy_rows(blocks, csv.writer(file))
 
-        def write_hierarchy(block):
-            for child in block.children:
-                writer.writerow([block.id, child.id])
-                write_hierarchy(child)
+def _write_adjacency_rows(blocks: List[CensusBlock], writer):
+    writer.writerow(ADJACENCY_HEADER)
+    for block in blocks:
+        for sibling in block.siblings:
+            writer.writerow([block.id, sibling.id])
 
-        for block in blocks:
-            write_hierarchy(block)
+def _write_demographic_rows(blocks: List[CensusBlock], writer):
+    writer.writerow(DEMOGRAPHIC_HEADER)
+    for block in blocks:
+        writer.writerow([block.id, block.population, block.jerries])
+
+def _write_hierarchy_rows(blocks: List[CensusBlock], writer):
+    # `blocks` is already the flattened tree, so each block writes its own
+    # children only.
+    writer.writerow(HIERARCHY_HEADER)
+    for block in blocks:
+        for child in block.children:
+            writer.writerow([block.id, child.id])
 
 def _gather_all_blocks(root: CensusBlock) -> List[CensusBlock]:
     all_blocks = []
@@ -106,3 +143,212 @@ def _gather_all_blocks(root: CensusBlock) -> List[CensusBlock]:
 
     traverse(root)
     return all_blocks
+
+@contextmanager
+def _open_for_read(source):
+    """Yield a readable text stream for either a path or an open file."""
+    if hasattr(source, 'read'):
+        yield source
+    else:
+        with open(source, newline="") as file:
+            yield file
+
+def _read_dicts(source):
+    """Yield CSV rows as dicts from a path, an open stream or a list of paths.
+
+    With a list, every file is expected to start with the same header row.
+    """
+    sources = source if isinstance(source, (list, tuple)) else [source]
+    for each in sources:
+        with _open_for_read(each) as file:
+            yield from csv.DictReader(file)
+
+def merged_csv_paths(directory):
+    """Paths of the `(adjacency, demographic, hierarchy)` CSVs in `directory`."""
+    directory = Path(directory)
+    return (directory / ADJACENCY_CSV,
+            directory / DEMOGRAPHIC_CSV,
+            directory / HIERARCHY_CSV)
+
+def census_csv_paths(directory):
+    """Find the census CSVs in `directory`.
+
+    Returns `(adjacency, demographic, hierarchy)`. For a merged census each is
+    a single path. For a sharded census (either the directory passed as
+    `outdir` to `run_sharded_census`, or one containing it as `shards/`), each
+    is a list with one path per shard, root first. Anything that reads census
+    CSVs in this repo accepts either form.
+    """
+    directory = Path(directory)
+    if (directory / ADJACENCY_CSV).exists():
+        return merged_csv_paths(directory)
+
+    if not (directory / SHARD_ROOT_DIR).is_dir() and (directory / 'shards').is_dir():
+        directory = directory / 'shards'
+    if not (directory / SHARD_ROOT_DIR).is_dir():
+        raise FileNotFoundError(f"no census CSVs or shards found in {directory}")
+
+    shard_dirs = sorted(directory.glob(f"{SHARD_DIR_PREFIX}*"),
+                        key=lambda path: int(path.name[len(SHARD_DIR_PREFIX):]))
+    shard_dirs = [directory / SHARD_ROOT_DIR] + shard_dirs
+    return ([shard_dir / ADJACENCY_CSV for shard_dir in shard_dirs],
+            [shard_dir / DEMOGRAPHIC_CSV for shard_dir in shard_dirs],
+            [shard_dir / HIERARCHY_CSV for shard_dir in shard_dirs])
+
+def parse_number(value: str):
+    """Block counts are ints unless blurring has made them fractional."""
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+def census_from_csv(adjacency_file=Path('adjacency.csv'),
+                    demographic_file=Path('demographic.csv'),
+                    hierarchy_file=Path('hierarchy.csv')) -> CensusBlock:
+    """Rebuild a census tree from the CSVs written by `subtree_to_csv`.
+
+    Each argument may be a path, an already-open text stream, or a list of
+    paths (eg: one per shard, see `census_csv_paths`).
+    Returns the root of the tree.
+    """
+    global id_counter
+
+    blocks: Dict[int, CensusBlock] = {}
+    for row in _read_dicts(demographic_file):
+        block_id = int(row['block'])
+        blocks[block_id] = CensusBlock(id=block_id,
+                                       population=parse_number(row['population']),
+                                       jerries=parse_number(row['num_positive']))
+
+    for row in _read_dicts(adjacency_file):
+        blocks[int(row['blockA'])].siblings.append(blocks[int(row['blockB'])])
+
+    child_ids = set()
+    for row in _read_dicts(hierarchy_file):
+        child_id = int(row['child_block'])
+        if child_id in child_ids:
+            # Older hierarchy files list each subtree more than once.
+            continue
+        blocks[int(row['parent_block'])].children.append(blocks[child_id])
+        child_ids.add(child_id)
+
+    roots = [block for block_id, block in blocks.items() if block_id not in child_ids]
+    if len(roots) != 1:
+        raise ValueError(f"census data must have exactly one root block, found {len(roots)}")
+
+    # Don't hand out IDs that collide with the loaded blocks.
+    id_counter = max(id_counter, max(blocks))
+    return roots[0]
+
+def iter_sections(infile: TextIO, sections=None) -> Iterator[Tuple[str, List[str]]]:
+    """Stream the rows of a census bundle or of a single census CSV.
+
+    Yields `(section, row)` pairs, where `section` is one of 'adjacency',
+    'demographic' or 'hierarchy' and `row` is the parsed CSV row. Sections
+    are recognized by their header rows, which are not yielded.
+
+    If `sections` is given, only rows from those sections are yielded. Rows
+    from other sections are skipped without being CSV-parsed, and reading
+    stops as soon as every requested section has been read. That matters
+    for bundles, whose adjacency section is by far the largest.
+    """
+    wanted = set(sections) if sections is not None else set(_SECTIONS.values())
+    remaining = set(wanted)
+    current = [None]
+
+    def wanted_lines():
+        for line in infile:
+            name = _HEADER_LINES.get(line.rstrip("\r\n"))
+            if name is not None:
+                if current[0] in wanted and not remaining:
+                    return
+                current[0] = name
+                remaining.discard(name)
+            elif current[0] is None:
+                if line.strip():
+                    raise ValueError(f"census data does not start with a section header: {line!r}")
+            elif current[0] in wanted:
+                yield line
+
+    # Rows are single lines, so `current` still names the section of the
+    # line the reader just parsed.
+    for row in csv.reader(wanted_lines()):
+        if row:
+            yield current[0], row
+
+def iter_census_rows(source, sections=None, offsets=None) -> Iterator[Tuple[str, List[str]]]:
+    """`iter_sections` over a path, an open stream, or a list of paths.
+
+    Lists may mix kinds of file, eg: `[demographic.csv, hierarchy.csv]`, or
+    one file per shard (see `census_csv_paths`).
+
+    To read the same files repeatedly, pass the same (initially empty) dict as
+    `offsets` each time. The byte offset of the first requested section in
+    each path is stored there, so later reads seek straight to it instead of
+    reading past eg: a bundle's adjacency section again.
+    """
+    sources = source if isinstance(source, (list, tuple)) else [source]
+    for each in sources:
+        if offsets is None or hasattr(each, 'read'):
+            with _open_for_read(each) as file:
+                yield from iter_sections(file, sections)
+            continue
+
+        if each not in offsets:
+            offsets[each] = _find_section(each, sections)
+        with open(each, newline="") as file:
+            file.seek(offsets[each])
+            yield from iter_sections(file, sections)
+
+def _find_section(path, sections=None, block_size=1 << 20) -> int:
+    """Byte offset of the first header line of any of `sections` in `path`.
+
+    Scans in binary, a block at a time, so it is much cheaper than reading
+    the lines. Returns 0 (the start of the file) if no header is found.
+    """
+    wanted = set(sections) if sections is not None else set(_SECTIONS.values())
+    headers = [b"\n" + line.encode() for line, name in _HEADER_LINES.items() if name in wanted]
+    if not headers:
+        return 0
+    keep = max(len(header) for header in headers)
+
+    with open(path, 'rb') as file:
+        position = 0  # file offset of the current block
+        tail = b"\n"  # the file start counts as a line start
+        while True:
+            block = file.read(block_size)
+            if not block:
+                return 0
+            buf = tail + block
+            hits = [index for index in (buf.find(header) for header in headers) if index >= 0]
+            if hits:
+                # +1 skips the newline in front of the header.
+                return position - len(tail) + min(hits) + 1
+            tail = buf[-keep:]
+            position += len(block)
+
+def split_bundle(infile: TextIO) -> Tuple[io.StringIO, io.StringIO, io.StringIO]:
+    """Split a bundle (see `CensusBlock.subtree_to_bundle`) into its sections.
+
+    Returns in-memory (adjacency, demographic, hierarchy) CSV streams, each
+    with its header row, ready for anything that accepts the separate CSVs.
+    A missing adjacency or hierarchy section is treated as empty.
+    """
+    sections = {name: io.StringIO() for name in _SECTIONS.values()}
+    writers = {name: csv.writer(stream) for name, stream in sections.items()}
+    for header, name in _SECTIONS.items():
+        writers[name].writerow(header)
+
+    num_blocks = 0
+    for section, row in iter_sections(infile):
+        writers[section].writerow(row)
+        if section == 'demographic':
+            num_blocks += 1
+    if num_blocks == 0:
+        raise ValueError("census bundle has no demographic rows")
+
+    for stream in sections.values():
+        stream.seek(0)
+    return sections['adjacency'], sections['demographic'], sections['hierarchy']
+
+def census_from_bundle(infile: TextIO) -> CensusBlock:
+    """Rebuild a census tree from a single bundle stream."""
+    return census_from_csv(*split_bundle(infile))
@@ -56,7 +56,8 @@ def _create_adjacency_lists(layer: List[CensusBlock],
     return ret
 
 def _create_tree_leaves(num_leaves: int, total_pop: int, total_jerries: int,
-                        adj_p: Tuple[float, float] = (0.2, 0.8)) -> List[CensusBlock]:
+                        adj_p: Tuple[float, float] = (0.2, 0.8),
+                        link_siblings: bool = True) -> List[CensusBlock]:
     pops = _split_population(total_pop, num_leaves)
     jerries = _distribute_jerries(total_jerries, pops)
 
@@ -64,14 +65,16 @@ def _create_tree_leaves(num_leaves: int, total_pop: int, total_jerries: int,
     for pop, jerry in zip(pops, jerries):
         leaves.append(CensusBlock(population=pop, jerries=jerry))
 
-    for leaf, adj in zip(leaves, _create_adjacency_lists(leaves, adj_p)):
-        leaf.siblings = adj
+    if link_siblings:
+        for leaf, adj in zip(leaves, _create_adjacency_lists(leaves, adj_p)):
+            leaf.siblings = adj
 
     return leaves
 
 
 def _create_tree_layer(num_in_layer: int, leaves: List[CensusBlock],
-                       adj_interval: Tuple[float, float] = (0.2, 0.8)) -> List[CensusBlock]:
+                       adj_interval: Tuple[float, float] = (0.2, 0.8),
+                       link_siblings: bool = True) -> List[CensusBlock]:
     """Equally assign child leaves to parent leaves"""
 
     children_per_parent = len(leaves) // num_in_layer
@@ -99,8 +102,9 @@ def _create_tree_layer(num_in_layer: int, leaves: List[CensusBlock],
     assert(len(leaves) == 0)
 
     # Add adjacency lists _within the layer_ only.
-    for parent, adj in zip(new_parents, _create_adjacency_lists(new_parents, adj_interval)):
-        parent.siblings = adj
+    if link_siblings:
+        for parent, adj in zip(new_parents, _create_adjacency_lists(new_parents, adj_interval)):
+            parent.siblings = adj
     return new_parents
 
 def run_mock_census(num_layers: int, fanout: int, total_pop: int,
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+import csv
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from . import census
+from .census import (CensusBlock, ADJACENCY_HEADER, HIERARCHY_HEADER,
+                     ADJACENCY_CSV, DEMOGRAPHIC_CSV, HIERARCHY_CSV,
+                     SHARD_ROOT_DIR, SHARD_DIR_PREFIX,
+                     _write_demographic_csv, _write_hierarchy_csv)
+from .datagen import (_split_population, _distribute_jerries,
+                      _create_tree_leaves, _create_tree_layer)
+
+def _layer_sizes(num_layers: int, fanout: int) -> List[int]:
+    """Number of blocks in each layer of one shard, leaves first.
+
+    A shard is one of the root's subtrees, so it has `num_layers` layers
+    (the shard root included).
+    """
+    return [fanout ** depth for depth in reversed(range(num_layers))]
+
+def _layer_id_offsets(layer_sizes: List[int]) -> List[int]:
+    """Offset of each layer's first block ID within a shard's ID range."""
+    offsets = [0]
+    for size in layer_sizes[:-1]:
+        offsets.append(offsets[-1] + size)
+    return offsets
+
+def _sample_neighbor_ids(own_index: int, layer_size: int, num_shards: int,
+                         shard_size: int, layer_offset: int,
+                         adj_interval: Tuple[float, float]) -> List[int]:
+    """Pick a block's siblings from its whole layer, across every shard.
+
+    Block IDs are a pure function of (shard, layer, position), so workers can
+    link to blocks in other shards without ever seeing them. Mirrors
+    `_create_adjacency_lists`: each block gets a uniform fraction of the rest
+    of its layer as neighbors.
+    """
+    num_others = layer_size * num_shards - 1
+    if num_others <= 0:
+        return []
+    num_neighbors = int(random.uniform(*adj_interval) * num_others)
+
+    ret = []
+    # Sampling indices rather than blocks means the other shards' blocks
+    # never need to exist in this process.
+    for index in random.sample(range(num_others), num_neighbors):
+        if index >= own_index:
+            index += 1  # skip ourselves
+        shard, position = divmod(index, layer_size)
+        ret.append(shard * shard_size + layer_offset + position + 1)
+    return ret
+
+def _generate_shard(shard: int, num_shards: int, num_layers: int, fanout: int,
+                    total_pop: int, total_jerries: int,
+                    adj_interval: Tuple[float, float], seed: int,
+                    outdir: Path) -> Tuple[int, int, int]:
+    """Worker: generate one top-level subtree and write it to `outdir`.
+
+    Returns `(shard_root_id, population, jerries)` for the stitching step.
+    """
+    seed_seq = np.random.SeedSequence(seed)
+    random.seed(int(seed_seq.generate_state(1)[0]))
+    np.random.seed(seed_seq.generate_state(1)[0])
+
+    layer_sizes = _layer_sizes(num_layers, fanout)
+    layer_offsets = _layer_id_offsets(layer_sizes)
+    shard_size = sum(layer_sizes)
+
+    # Every shard owns a disjoint, contiguous block of IDs.
+    census.id_counter = shard * shard_size
+
+    layers = [_create_tree_leaves(layer_sizes[0], total_pop, total_jerries,
+                                  adj_interval, link_siblings=False)]
+    for size in layer_sizes[1:]:
+        layers.append(_create_tree_layer(size, layers[-1], adj_interval,
+                                         link_siblings=False))
+
+    shard_root = layers[-1][0]
+    assert(shard_root.id == (shard + 1) * shard_size)
+
+    outdir.mkdir(parents=True, exist_ok=True)
+    with open(outdir / ADJACENCY_CSV, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(ADJACENCY_HEADER)
+        for layer, size, offset in zip(layers, layer_sizes, layer_offsets):
+            for position, block in enumerate(layer):
+                assert(block.id == shard * shard_size + offset + position + 1)
+                own_index = shard * size + position
+                for sibling_id in _sample_neighbor_ids(own_index, size, num_shards,
+                                                       shard_size, offset,
+                                                       adj_interval):
+                    writer.writerow([block.id, sibling_id])
+
+    flat_tree = census._gather_all_blocks(shard_root)
+    _write_demographic_csv(flat_tree, outdir / DEMOGRAPHIC_CSV)
+    _write_hierarchy_csv(flat_tree, outdir / HIERARCHY_CSV)
+
+    return shard_root.id, shard_root.population, shard_root.jerries
+
+def _write_root(root: CensusBlock, shard_root_ids: Sequence[int], outdir: Path):
+    """Stitch the shards together: the root block and its hierarchy rows."""
+    outdir.mkdir(parents=True, exist_ok=True)
+    with open(outdir / ADJACENCY_CSV, mode="w", newline="") as file:
+        csv.writer(file).writerow(ADJACENCY_HEADER)
+    _write_demographic_csv([root], outdir / DEMOGRAPHIC_CSV)
+    with open(outdir / HIERARCHY_CSV, mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(HIERARCHY_HEADER)
+        for shard_root_id in shard_root_ids:
+            writer.writerow([root.id, shard_root_id])
+
+def merge_shards(shard_dirs: Sequence[Path],
+                 adjacency_outfile: Path = Path('adjacency.csv'),
+                 demographic_outfile: Path = Path('demographic.csv'),
+                 hierarchy_outfile: Path = Path('hierarchy.csv')):
+    """Concatenate per-shard CSVs into one set of census CSVs.
+
+    Optional: everything that reads census CSVs also accepts the shard
+    directories directly (see `census_csv_paths`). This is a serial pass that
+    copies every row again, so it costs O(census size); it streams line by
+    line, so memory use doesn't depend on the census size.
+    """
+    for name, outfile in ((ADJACENCY_CSV, adjacency_outfile),
+                          (DEMOGRAPHIC_CSV, demographic_outfile),
+                          (HIERARCHY_CSV, hierarchy_outfile)):
+        with open(outfile, mode="w", newline="") as out:
+            for i, shard_dir in enumerate(shard_dirs):
+                with open(Path(shard_dir) / name, newline="") as file:
+                    header = file.readline()
+                    if i == 0:
+                        out.write(header)
+                    for line in file:
+                        out.write(line)
+
+def run_sharded_census(num_layers: int, fanout: int, total_pop: int,
+                       total_jerries: int, outdir: Path,
+                       adj_interval: Tuple[float, float] = (0.2, 0.8),
+                       workers: Optional[int] = None,
+                       seed: Optional[int] = None) -> List[Path]:
+    """Run a mock census across several processes, one per top-level subtree.
+
+    The root's population and jerries are split among its `fanout` children
+    up front. Each child subtree ("shard") is then generated by a worker with
+    its own RNG stream and written to `outdir/shard-<n>/`. The root block is
+    written to `outdir/root/`. No process ever holds the whole tree, and the
+    only serial work after the workers finish is writing the root block.
+
+    Arguments are as for `run_mock_census`, plus:
+        - `outdir`: directory to write the shard directories to.
+        - `workers`: max number of worker processes (default: CPU count).
+        - `seed`: seed for reproducible output.
+    Returns:
+        - The list of directories written, root first. `census_csv_paths()`
+          finds the same files from `outdir`; `merge_shards()` concatenates
+          them into a single set of census CSVs if one is needed.
+    """
+    if num_layers < 1:
+        raise ValueError("sharded generation needs at least one layer below the root")
+    if workers is not None and workers < 1:
+        raise ValueError("sharded generation needs at least one worker")
+
+    outdir = Path(outdir)
+    seed_seq = np.random.SeedSequence(seed)
+    root_seq, *shard_seqs = seed_seq.spawn(fanout + 1)
+
+    random.seed(int(root_seq.generate_state(1)[0]))
+    np.random.seed(root_seq.generate_state(1)[0])
+    pops = _split_population(total_pop, fanout)
+    jerries = _distribute_jerries(total_jerries, pops)
+
+    shard_dirs = [outdir / f"{SHARD_DIR_PREFIX}{shard}" for shard in range(fanout)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_generate_shard, shard, fanout, num_layers, fanout,
+                               pops[shard], jerries[shard], adj_interval,
+                               int(shard_seqs[shard].generate_state(1)[0]),
+                               shard_dirs[shard])
+                   for shard in range(fanout)]
+        results = [future.result() for future in futures]
+
+    shard_size = sum(_layer_sizes(num_layers, fanout))
+    root = CensusBlock(id=fanout * shard_size + 1,
+                       population=sum(pop for _, pop, _ in results),
+                       jerries=sum(jerry for _, _, jerry in results))
+    root_dir = outdir / SHARD_ROOT_DIR
+    _write_root(root, [shard_root_id for shard_root_id, _, _ in results], root_dir)
+
+    return [root_dir] + shard_dirs
+
+if __name__ == '__main__':
+    dirs = run_sharded_census(num_layers=2, fanout=2, total_pop=400,
+                              total_jerries=10, outdir=Path('shards'))
+    merge_shards(dirs)
@@ -1 +1,3 @@
 from .gerry_alg import gerrymander
+from .stats import GerryStats
+from .plan import read_plan, read_plan_rows, write_plan
@@ -1,17 +1,34 @@
-import pandas as pd
-import networkx as nx
 from pathlib import Path
 
+from .stats import GerryStats, _NullStats
+
+def _graph_libs():
+    """Import pandas and networkx on first use, since they're slow to import."""
+    import pandas as pd
+    import networkx as nx
+    return pd, nx
+
+def _read_csv(source):
+    """`pd.read_csv`, but also accepts a list of files (eg: census shards)."""
+    pd, _ = _graph_libs()
+
+    if isinstance(source, (list, tuple)):
+        return pd.concat([pd.read_csv(each) for each in source], ignore_index=True)
+    return pd.read_csv(source)
+
 def _load_data(adjacency_file, demographics_file, hierarchy_file):
     """Given a census tree as CSV input, returns useful information about the leaf nodes.
 
+    Each file may also be a list of files, as for a sharded census.
+
     Returns:
         - The adjacency graph of the leaf nodes.
         - A dictionary with demographics of the leaf nodes
     """
+    _, nx = _graph_libs()
 
     #Load heirarchy as a graph
-    hier_df = pd.read_csv(hierarchy_file)
+    hier_df = _read_csv(hierarchy_file)
     H = nx.from_pandas_edgelist(hier_df, source='parent_block',
                                 target='child_block', create_using=nx.DiGraph())
 
@@ -21,14 +38,14 @@ def _load_data(adjacency_file, demographics_file, hierarchy_file):
             leaves.add(node)
     
     # Load adjacency as a graph
-    adj_df = pd.read_csv(adjacency_file)
+    adj_df = _read_csv(adjacency_file)
     G = nx.Graph()
     for _, row in adj_df.iterrows():
         if(row['blockA'] in leaves and row['blockB'] in leaves):
             G.add_edge(int(row['blockA']), int(row['blockB']))  # Convert to integers
    
     # Load demographic data
-    demo_df = pd.read_csv(demographics_file)
+    demo_df = _read_csv(demographics_file)
     demographics = {
         int(row['block']): {
             'population': float(row['population']), 
@@ -49,7 +66,8 @@ def _assign_block_to_district(district, block, demographics):
     district['population'] += demographics[block]['population']
     district['democrats'] += demographics[block]['democrats']
 
-def gerrymander(adjacency_file, demographics_file, hierarchy_file, num_districts, party):
+def gerrymander(adjacency_file, demographics_file, hierarchy_file, num_districts, party,
+                return_stats=False):
     """Create a set of legislative districts designed to favor a party.
 
     Arguments:
@@ -57,11 +75,21 @@ def gerrymander(adjacency_file, demographics_file, hierarchy_file, num_districts
           see README.
         - num_districts: the number of districts to produce in the output.
         - party: the party to gerrymander _for_.
+        - return_stats: if set, also collect stage timings and counters
+          (see `GerryStats`). Off by default, since counting has a small cost.
     Returns:
         - A list of districts. Each district is a set of block IDs.
+        - If `return_stats` is set, a `(districts, stats)` tuple instead.
     """
+    stats = GerryStats() if return_stats else None
+    timer = stats if stats is not None else _NullStats()
+
+    # Pay for the slow imports before the `load` timer starts.
+    _graph_libs()
+
     # Step 1: Load data
-    G, demographics = _load_data(adjacency_file, demographics_file, hierarchy_file)
+    with timer.stage('load'):
+        G, demographics = _load_data(adjacency_file, demographics_file, hierarchy_file)
 
     # Step 2: Calculate target population per district
     total_population = sum(d['population'] for d in demographics.values())
@@ -71,28 +99,43 @@ def gerrymander(adjacency_file, demographics_file, hierarchy_file, num_districts
     districts = _initialize_districts(num_districts, target_population)
 
     # Step 4: Sort blocks by favorability to the target party
-    sorted_blocks = sorted(demographics.keys(),
-                           key=lambda b: _favorability_score(demographics[b], party),
-                           reverse=True)
+    with timer.stage('sort'):
+        sorted_blocks = sorted(demographics.keys(),
+                               key=lambda b: _favorability_score(demographics[b], party),
+                               reverse=True)
 
     # Step 5: Assign blocks to districts based on packing/cracking strategy
-    for block in sorted_blocks:
-        assigned = False
-        for district in districts.values():
-            # Ensure the block does not exceed target population
-            if district['population'] + demographics[block]['population'] <= target_population:
-                if _is_contiguous(district, block, G) or district['population'] == 0:
-                    _assign_block_to_district(district, block, demographics)
-                    assigned = True
-                    break
-        # yash: this is printing _constantly_. I disable this warning.
-        # if not assigned:
-        #     print(f"Block {block} could not be assigned due to population/contiguity constraints.")
+    with timer.stage('assign'):
+        for block in sorted_blocks:
+            assigned = False
+            for district in districts.values():
+                # Ensure the block does not exceed target population
+                if district['population'] + demographics[block]['population'] <= target_population:
+                    if _is_contiguous(district, block, G, stats) or district['population'] == 0:
+                        _assign_block_to_district(district, block, demographics)
+                        assigned = True
+                        break
+            # yash: this is printing _constantly_. I disable this warning.
+            # if not assigned:
+            #     print(f"Block {block} could not be assigned due to population/contiguity constraints.")
+            # Unassigned blocks are counted in `stats.blocks_unassigned` instead.
+            if stats is not None:
+                if assigned:
+                    stats.blocks_assigned += 1
+                else:
+                    stats.blocks_unassigned += 1
 
     # Step 6: Refinement to balance populations across districts
+    # Not timed while disabled; wrap it in `timer.stage('refine')` when re-enabled.
     # refine_districts(districts, G, target_population, demographics)
 
-    return [district['blocks'] for district in districts.values()]
+    plan = [district['blocks'] for district in districts.values()]
+    if stats is None:
+        return plan
+
+    stats.target_population = target_population
+    stats.district_populations = [district['population'] for district in districts.values()]
+    return plan, stats
 
 def _favorability_score(block_demo, party):
     # Calculate favorability score for a block for the given party
@@ -103,9 +146,18 @@ def _favorability_score(block_demo, party):
             return 0
         return (block_demo['population'] - block_demo['democrats']) / block_demo['population']
 
-def _is_contiguous(district, block, G):
+def _is_contiguous(district, block, G, stats=None):
     # Check if the block is directly adjacent to any block in the district
+    if stats is None:
+        for b in district['blocks']:
+            if G.has_edge(b, block):
+                return True
+        return False
+
+    # Same check, but counted. Kept separate so the common path stays cheap.
+    stats.contiguity_checks += 1
     for b in district['blocks']:
+        stats.has_edge_calls += 1
         if G.has_edge(b, block):
             return True
     return False
@@ -152,7 +204,8 @@ if __name__ == "__main__":
     party = 'R'  # 'R' for Republicans, 'D' for Democrats
 
     # Run the debugging version of the gerrymander algorithm
-    results = gerrymander(adjacency_file, demographics_file, hierarchy_file, num_districts, party)
+    results, stats = gerrymander(adjacency_file, demographics_file, hierarchy_file,
+                                 num_districts, party, return_stats=True)
 
     # Load demographics to calculate statistics
     _, demographics = _load_data(adjacency_file, demographics_file, hierarchy_file)
@@ -169,3 +222,5 @@ if __name__ == "__main__":
         print(f"  Democrats: {total_democrats}")
         print(f"  Republicans: {total_republicans}")
         print(f"  Blocks: {sorted(blocks)}")
+
+    print(f"\n{stats}")
@@ -0,0 +1,52 @@
+import csv
+from typing import Iterator, List, Set, TextIO, Tuple
+
+NUM_DISTRICTS_KEY = "num_districts"
+PLAN_HEADER = ["block", "district"]
+
+def write_plan(districts: List[Set[int]], outfile: TextIO):
+    """Write a districting plan as a `(block,district)` CSV.
+
+    Districts are numbered by their position in `districts`. The first line
+    records the number of districts, so empty districts survive a round trip.
+    """
+    writer = csv.writer(outfile)
+    writer.writerow([NUM_DISTRICTS_KEY, len(districts)])
+    writer.writerow(PLAN_HEADER)
+    for district_id, blocks in enumerate(districts):
+        for block in sorted(blocks):
+            writer.writerow([block, district_id])
+
+def read_plan_rows(infile: TextIO) -> Tuple[int, Iterator[Tuple[int, int]]]:
+    """Start reading a plan written by `write_plan` without loading it all.
+
+    Returns the number of districts and an iterator over `(block, district)`
+    rows. The iterator reads `infile` lazily.
+    """
+    reader = csv.reader(infile)
+    first = next(reader, None)
+    if first is None or len(first) != 2 or first[0] != NUM_DISTRICTS_KEY:
+        raise ValueError(f"plan must start with a '{NUM_DISTRICTS_KEY},<n>' row, got {first!r}")
+    num_districts = int(first[1])
+
+    header = next(reader, None)
+    if header != PLAN_HEADER:
+        raise ValueError(f"plan is missing its '{','.join(PLAN_HEADER)}' header, got {header!r}")
+
+    def rows():
+        for block, district in reader:
+            district_id = int(district)
+            if not 0 <= district_id < num_districts:
+                raise ValueError(f"plan assigns block {block} to district {district_id}, "
+                                 f"but only has {num_districts} districts")
+            yield int(block), district_id
+
+    return num_districts, rows()
+
+def read_plan(infile: TextIO) -> List[Set[int]]:
+    """Read a plan written by `write_plan` back into a list of block ID sets."""
+    num_districts, rows = read_plan_rows(infile)
+    districts: List[Set[int]] = [set() for _ in range(num_districts)]
+    for block, district_id in rows:
+        districts[district_id].add(block)
+    return districts
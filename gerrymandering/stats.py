@@ -0,0 +1,67 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class GerryStats:
+    """Timers and counters collected during a single `gerrymander()` run.
+
+    Stage timings are wall-clock seconds keyed by stage name (`load`, `sort`,
+    `assign`); refinement is disabled, so it isn't timed. Population deviation
+    is measured against the target district population, as a fraction of
+    that target.
+    """
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    contiguity_checks: int = 0
+    has_edge_calls: int = 0
+    blocks_assigned: int = 0
+    blocks_unassigned: int = 0
+    target_population: float = 0
+    district_populations: List[float] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block, accumulating into `stage_seconds[name]`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0) + elapsed
+
+    @property
+    def max_population_deviation(self) -> float:
+        """Largest |district population - target| / target over all districts."""
+        if not self.target_population or not self.district_populations:
+            return 0
+        return max(abs(pop - self.target_population)
+                   for pop in self.district_populations) / self.target_population
+
+    def summary(self) -> str:
+        """Generate a human-readable report of the collected stats."""
+        lines = ["Stage timings:"]
+        for name, seconds in self.stage_seconds.items():
+            lines.append(f"  {name}: {seconds:.4f}s")
+        lines.append(f"Contiguity checks: {self.contiguity_checks}")
+        lines.append(f"has_edge calls: {self.has_edge_calls}")
+        lines.append(f"Blocks assigned: {self.blocks_assigned}")
+        lines.append(f"Blocks unassigned: {self.blocks_unassigned}")
+        lines.append(f"Max population deviation: {self.max_population_deviation:.2%}")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.summary()
+
+
+@contextmanager
+def _no_stage():
+    yield
+
+
+class _NullStats:
+    """Stand-in used when stats are disabled; every stage is a no-op."""
+
+    def stage(self, name: str):
+        return _no_stage()
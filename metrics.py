@@ -1,17 +1,20 @@
 import re
 from dataclasses import dataclass
+from itertools import islice
 from typing import Set, List, Dict, Tuple
 from datagen import CensusBlock
+from datagen.census import iter_census_rows, parse_number
+from gerrymandering import read_plan_rows
+
+@dataclass
+class DistrictResult:
+    republicans: float = 0
+    democrats: float = 0
 
 def efficiency_gap(tree: CensusBlock, districts: List[Set[int]]) -> Tuple[float, List]:
     leaves = tree.get_leaf_nodes()
     leaves = { leaf.id: leaf for leaf in leaves }
 
-    @dataclass
-    class DistrictResult:
-        republicans: float = 0
-        democrats: float = 0
-
     results: List[DistrictResult] = []
     for district in districts:
         result = DistrictResult()
@@ -20,6 +23,80 @@ def efficiency_gap(tree: CensusBlock, districts: List[Set[int]]) -> Tuple[float,
             result.republicans += leaves[block_id].population - leaves[block_id].jerries
         results.append(result)
 
+    return _efficiency_gap_of_results(results)
+
+def efficiency_gap_from_files(census_files, plan_file,
+                              chunk_size: int = 1_000_000) -> Tuple[float, List]:
+    """Compute the efficiency gap without loading the census into memory.
+
+    Reads the census and the plan straight from files. The plan is read
+    `chunk_size` rows at a time; for each chunk, the demographic (and
+    hierarchy) rows are streamed once and joined against the chunk. Memory is
+    O(num districts + chunk_size), at the cost of one pass over the census
+    files' demographic and hierarchy rows per plan chunk. A bundle's
+    adjacency section is skipped without being parsed, and after the first
+    pass it isn't read at all.
+
+    For a valid plan the result is the same as `efficiency_gap` (up to
+    floating-point summation order for blurred data).
+
+    Arguments:
+        - census_files: a census bundle (see `CensusBlock.subtree_to_bundle`),
+          or a list like `[demographic.csv, hierarchy.csv]` (or their
+          per-shard lists). Must be paths, since they may be read more than
+          once. The hierarchy is only used to reject non-leaf blocks; without
+          it, a non-leaf block is scored with its whole subtree's totals.
+        - plan_file: path or open stream of a plan written by
+          `gerrymandering.write_plan`. Read once.
+        - chunk_size: how many plan rows to hold in memory at once.
+    Raises:
+        - KeyError if the plan names a block that isn't a leaf of the census
+          (`efficiency_gap` raises KeyError there too).
+        - ValueError if a block is assigned to two districts within one
+          chunk. `efficiency_gap` counts such a block in both districts; a
+          repeat in a *different* chunk can't be detected in bounded memory.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if not hasattr(plan_file, 'read'):
+        with open(plan_file, newline="") as file:
+            return efficiency_gap_from_files(census_files, file, chunk_size)
+
+    num_districts, rows = read_plan_rows(plan_file)
+    results = [DistrictResult() for _ in range(num_districts)]
+    offsets: Dict = {}
+    while True:
+        chunk: Dict[int, int] = {}
+        for block_id, district_id in islice(rows, chunk_size):
+            if block_id in chunk:
+                raise ValueError(f"block {block_id} is assigned to more than one district")
+            chunk[block_id] = district_id
+        if not chunk:
+            break
+
+        matched = set()
+        for section, row in iter_census_rows(census_files, {'demographic', 'hierarchy'},
+                                             offsets):
+            block_id = int(row[0])
+            if block_id not in chunk:
+                continue
+            if section == 'hierarchy':
+                # `block_id` is a parent, so not a leaf.
+                raise KeyError(block_id)
+
+            population, jerries = parse_number(row[1]), parse_number(row[2])
+            district_id = chunk[block_id]
+            matched.add(block_id)
+            results[district_id].democrats += jerries
+            results[district_id].republicans += population - jerries
+
+        if len(matched) != len(chunk):
+            missing = next(block_id for block_id in chunk if block_id not in matched)
+            raise KeyError(missing)
+
+    return _efficiency_gap_of_results(results)
+
+def _efficiency_gap_of_results(results: List[DistrictResult]) -> Tuple[float, List]:
     # Initialize totals for wasted votes
     total_dem_wasted = 0
     total_rep_wasted = 0
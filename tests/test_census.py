@@ -0,0 +1,86 @@
+import csv
+import io
+
+import pytest
+
+from datagen.census import CensusBlock, census_from_bundle, census_from_csv
+from gerrymandering import read_plan, read_plan_rows, write_plan
+
+def _small_tree():
+    """root -> (mid -> (a, b), c), with a few sibling links."""
+    a = CensusBlock(population=5, jerries=3)
+    b = CensusBlock(population=4, jerries=1)
+    c = CensusBlock(population=2.5, jerries=1)
+    mid = CensusBlock(population=9, jerries=4, children=[a, b])
+    root = CensusBlock(population=11.5, jerries=5, children=[mid, c])
+    a.siblings = [b]
+    b.siblings = [a]
+    mid.siblings = [c]
+    return root
+
+def _edges(root):
+    return sorted((block.id, child.id)
+                  for block in _all_blocks(root) for child in block.children)
+
+def _all_blocks(root):
+    blocks = [root]
+    for child in root.children:
+        blocks.extend(_all_blocks(child))
+    return blocks
+
+def test_bundle_round_trip():
+    root = _small_tree()
+    bundle = io.StringIO()
+    root.subtree_to_bundle(bundle)
+    bundle.seek(0)
+
+    loaded = census_from_bundle(bundle)
+    assert str(loaded) == str(root)
+    assert _edges(loaded) == _edges(root)
+    for original, copy in zip(_all_blocks(root), _all_blocks(loaded)):
+        assert [s.id for s in copy.siblings] == [s.id for s in original.siblings]
+
+def test_hierarchy_lists_each_edge_once(tmp_path):
+    root = _small_tree()
+    root.subtree_to_csv(adjacency_outfile=tmp_path / 'adjacency.csv',
+                        demographic_outfile=tmp_path / 'demographic.csv',
+                        hierarchy_outfile=tmp_path / 'hierarchy.csv')
+    with open(tmp_path / 'hierarchy.csv', newline="") as file:
+        rows = [(int(parent), int(child)) for parent, child in list(csv.reader(file))[1:]]
+    assert sorted(rows) == _edges(root)
+
+def test_duplicate_hierarchy_rows_are_skipped(tmp_path):
+    root = _small_tree()
+    root.subtree_to_csv(adjacency_outfile=tmp_path / 'adjacency.csv',
+                        demographic_outfile=tmp_path / 'demographic.csv',
+                        hierarchy_outfile=tmp_path / 'hierarchy.csv')
+
+    # Older writers repeated every subtree once per ancestor.
+    with open(tmp_path / 'hierarchy.csv', 'a', newline="") as file:
+        writer = csv.writer(file)
+        for parent, child in _edges(root.children[0]):
+            writer.writerow([parent, child])
+
+    loaded = census_from_csv(tmp_path / 'adjacency.csv', tmp_path / 'demographic.csv',
+                             tmp_path / 'hierarchy.csv')
+    assert _edges(loaded) == _edges(root)
+    assert len(loaded.get_leaf_nodes()) == 3
+
+def test_plan_round_trip():
+    districts = [{3, 1}, set(), {2}, set()]
+    plan = io.StringIO()
+    write_plan(districts, plan)
+    plan.seek(0)
+    assert read_plan(plan) == districts
+
+@pytest.mark.parametrize('text', [
+    "",
+    "block,district\n1,0\n",
+    "num_districts\nblock,district\n",
+    "num_districts,2\n1,0\n",
+    "num_districts,2\nblock,district\n1,2\n",
+])
+def test_malformed_plan_is_rejected(text):
+    with pytest.raises(ValueError):
+        num_districts, rows = read_plan_rows(io.StringIO(text))
+        list(rows)
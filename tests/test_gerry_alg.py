@@ -0,0 +1,37 @@
+import random
+
+import numpy as np
+import pytest
+
+from datagen import run_mock_census
+from gerrymandering import gerrymander, GerryStats
+from gerrymandering.gerry_alg import _load_data
+
+@pytest.fixture
+def census_files(tmp_path):
+    random.seed(5)
+    np.random.seed(5)
+    tree = run_mock_census(num_layers=2, fanout=3, total_pop=900, total_jerries=400)
+    files = (tmp_path / 'adjacency.csv', tmp_path / 'demographic.csv',
+             tmp_path / 'hierarchy.csv')
+    tree.subtree_to_csv(adjacency_outfile=files[0],
+                        demographic_outfile=files[1],
+                        hierarchy_outfile=files[2])
+    return files
+
+def test_stats_are_collected(census_files):
+    plan, stats = gerrymander(*census_files, 3, 'D', return_stats=True)
+    _, demographics = _load_data(*census_files)
+
+    assert isinstance(stats, GerryStats)
+    assert set(stats.stage_seconds) == {'load', 'sort', 'assign'}
+    assert stats.blocks_assigned + stats.blocks_unassigned == len(demographics)
+    assert stats.blocks_assigned == sum(len(district) for district in plan)
+    assert stats.has_edge_calls >= 0
+    assert stats.contiguity_checks > 0
+    assert len(stats.district_populations) == 3
+
+def test_stats_off_returns_plain_plan(census_files):
+    plan = gerrymander(*census_files, 3, 'D')
+    assert isinstance(plan, list)
+    assert plan == gerrymander(*census_files, 3, 'D', return_stats=True)[0]
@@ -0,0 +1,95 @@
+import io
+import random
+
+import numpy as np
+import pytest
+
+import metrics
+from datagen import run_mock_census
+from gerrymandering import read_plan, write_plan
+
+NUM_DISTRICTS = 6
+
+@pytest.fixture
+def census(tmp_path):
+    random.seed(3)
+    np.random.seed(3)
+    tree = run_mock_census(num_layers=2, fanout=3, total_pop=900, total_jerries=400)
+
+    # Leave the last district empty, to check it isn't dropped.
+    leaf_ids = [leaf.id for leaf in tree.get_leaf_nodes()]
+    districts = [set() for _ in range(NUM_DISTRICTS)]
+    for leaf_id in leaf_ids:
+        districts[random.randrange(NUM_DISTRICTS - 1)].add(leaf_id)
+
+    tree.subtree_to_csv(adjacency_outfile=tmp_path / 'adjacency.csv',
+                        demographic_outfile=tmp_path / 'demographic.csv',
+                        hierarchy_outfile=tmp_path / 'hierarchy.csv')
+    with open(tmp_path / 'bundle.csv', 'w', newline="") as file:
+        tree.subtree_to_bundle(file)
+    with open(tmp_path / 'plan.csv', 'w', newline="") as file:
+        write_plan(districts, file)
+    return tree, districts, tmp_path
+
+def test_plan_round_trip_keeps_empty_districts(census):
+    _, districts, tmp_path = census
+    with open(tmp_path / 'plan.csv', newline="") as file:
+        assert read_plan(file) == districts
+
+def _census_files(tmp_path, kind):
+    if kind == 'bundle':
+        return tmp_path / 'bundle.csv'
+    return [tmp_path / 'demographic.csv', tmp_path / 'hierarchy.csv']
+
+def _plan_stream(districts):
+    plan = io.StringIO()
+    write_plan(districts, plan)
+    plan.seek(0)
+    return plan
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 1_000_000])
+@pytest.mark.parametrize('kind', ['csvs', 'bundle'])
+def test_streaming_matches_in_memory(census, chunk_size, kind):
+    tree, districts, tmp_path = census
+    expected = metrics.efficiency_gap(tree, districts)
+    actual = metrics.efficiency_gap_from_files(_census_files(tmp_path, kind),
+                                               tmp_path / 'plan.csv',
+                                               chunk_size=chunk_size)
+    assert actual == expected
+    assert len(actual[1]) == NUM_DISTRICTS
+
+@pytest.mark.parametrize('kind', ['csvs', 'bundle'])
+def test_unknown_plan_block_raises(census, kind):
+    tree, districts, tmp_path = census
+    districts[0].add(10_000)
+
+    with pytest.raises(KeyError):
+        metrics.efficiency_gap(tree, districts)
+    with pytest.raises(KeyError):
+        metrics.efficiency_gap_from_files(_census_files(tmp_path, kind),
+                                          _plan_stream(districts), chunk_size=4)
+
+@pytest.mark.parametrize('kind', ['csvs', 'bundle'])
+def test_non_leaf_plan_block_raises(census, kind):
+    tree, districts, tmp_path = census
+    districts[0].add(tree.children[0].id)
+
+    with pytest.raises(KeyError):
+        metrics.efficiency_gap(tree, districts)
+    with pytest.raises(KeyError):
+        metrics.efficiency_gap_from_files(_census_files(tmp_path, kind),
+                                          _plan_stream(districts), chunk_size=4)
+
+def test_block_in_two_districts_raises(census):
+    _, districts, tmp_path = census
+    districts[1].add(next(iter(districts[0])))
+
+    with pytest.raises(ValueError):
+        metrics.efficiency_gap_from_files(_census_files(tmp_path, 'csvs'),
+                                          _plan_stream(districts))
+
+def test_chunk_size_must_be_positive(census):
+    _, _, tmp_path = census
+    with pytest.raises(ValueError):
+        metrics.efficiency_gap_from_files(_census_files(tmp_path, 'csvs'),
+                                          tmp_path / 'plan.csv', chunk_size=0)
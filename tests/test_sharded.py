@@ -0,0 +1,95 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from datagen.census import census_from_csv, census_csv_paths
+from datagen.sharded import (_layer_sizes, _layer_id_offsets, _sample_neighbor_ids,
+                             run_sharded_census, merge_shards)
+
+NUM_LAYERS = 3
+FANOUT = 3
+
+def _layers_by_depth(root):
+    layers = [[root]]
+    while layers[-1][0].children:
+        layers.append([child for block in layers[-1] for child in block.children])
+    return layers
+
+def _read_files(dirs):
+    return {str(path.relative_to(path.parents[1])): path.read_text()
+            for shard_dir in dirs for path in sorted(Path(shard_dir).iterdir())}
+
+@pytest.fixture
+def sharded(tmp_path):
+    dirs = run_sharded_census(NUM_LAYERS, FANOUT, total_pop=3000, total_jerries=1000,
+                              outdir=tmp_path / 'shards', workers=2, seed=7)
+    return tmp_path, dirs
+
+def test_layer_id_layout():
+    sizes = _layer_sizes(NUM_LAYERS, FANOUT)
+    assert sizes == [9, 3, 1]
+    assert _layer_id_offsets(sizes) == [0, 9, 12]
+
+def test_sampled_neighbors_stay_in_layer():
+    random.seed(0)
+    sizes = _layer_sizes(NUM_LAYERS, FANOUT)
+    shard_size = sum(sizes)
+    offset = _layer_id_offsets(sizes)[1]
+    size = sizes[1]
+    layer_ids = {shard * shard_size + offset + position + 1
+                 for shard in range(FANOUT) for position in range(size)}
+
+    for own_index in range(size * FANOUT):
+        shard, position = divmod(own_index, size)
+        own_id = shard * shard_size + offset + position + 1
+        neighbors = _sample_neighbor_ids(own_index, size, FANOUT, shard_size,
+                                         offset, (1.0, 1.0))
+        assert set(neighbors) == layer_ids - {own_id}
+
+def test_tree_matches_id_arithmetic(sharded):
+    _, dirs = sharded
+    root = census_from_csv(*census_csv_paths(dirs[0].parent))
+    layers = _layers_by_depth(root)
+
+    assert [len(layer) for layer in layers] == [1, 3, 9, 27]
+    assert root.population == 3000
+    assert root.jerries == 1000
+    assert sum(leaf.population for leaf in root.get_leaf_nodes()) == 3000
+
+    all_ids = [block.id for layer in layers for block in layer]
+    assert sorted(all_ids) == list(range(1, len(all_ids) + 1))
+
+    for layer in layers:
+        layer_ids = {block.id for block in layer}
+        for block in layer:
+            sibling_ids = {sibling.id for sibling in block.siblings}
+            assert block.id not in sibling_ids
+            assert sibling_ids <= layer_ids
+
+    # With three shards per layer, some siblings must cross shard boundaries.
+    shard_size = sum(_layer_sizes(NUM_LAYERS, FANOUT))
+    assert any((block.id - 1) // shard_size != (sibling.id - 1) // shard_size
+               for block in layers[-1] for sibling in block.siblings)
+
+def test_same_seed_same_output_regardless_of_workers(tmp_path):
+    one = run_sharded_census(NUM_LAYERS, FANOUT, 3000, 1000, tmp_path / 'one',
+                             workers=1, seed=11)
+    many = run_sharded_census(NUM_LAYERS, FANOUT, 3000, 1000, tmp_path / 'many',
+                              workers=3, seed=11)
+    assert _read_files(one) == _read_files(many)
+
+def test_merged_output_matches_shards(sharded):
+    tmp_path, dirs = sharded
+    merged = tmp_path / 'merged'
+    merged.mkdir()
+    merge_shards(dirs, *(merged / name for name in
+                         ('adjacency.csv', 'demographic.csv', 'hierarchy.csv')))
+
+    from_merged = census_from_csv(*census_csv_paths(merged))
+    from_shards = census_from_csv(*census_csv_paths(tmp_path))
+    assert str(from_merged) == str(from_shards)
+    for merged_block, shard_block in zip(_layers_by_depth(from_merged)[-1],
+                                         _layers_by_depth(from_shards)[-1]):
+        assert ([sibling.id for sibling in merged_block.siblings] ==
+                [sibling.id for sibling in shard_block.siblings])